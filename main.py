@@ -1,7 +1,13 @@
+import asyncio
 import logging
 
 from utils.notification_bot import NotificationBot
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,6 +17,8 @@ logging.basicConfig(
 
 
 def main():
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     bot = NotificationBot()
     bot.run()
 
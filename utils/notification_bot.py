@@ -1,8 +1,11 @@
-import json
+import re
+import hashlib
 import logging
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import orjson
+from functools import lru_cache
+from lxml import etree
 from telegram.ext import Application
 
 from .config import load_config
@@ -12,17 +15,60 @@ from .senders.whatsapp_sender import WhatsAppSender
 
 logger = logging.getLogger(__name__)
 
+_MD_RE = re.compile(r'[_*\[\]()~`>#+\-=|{}.!]')
+
+_TG_SHORT = "📣 New {section}!\n\n{title}\n🔗 {link}"
+_TG_FULL = _TG_SHORT + "\n🗓 {date}\n👤 {author}"
+_WA_SHORT = "📢 New {section} Alert!\n{title}\n🔗 {link}"
+_WA_FULL = _WA_SHORT + "\n🗓 {date}\n👤 {author}"
+
 
 class NotificationBot:
+    _SECTIONS_MAP = {
+        "Latest announcements": "Latest Announcements",
+        "Exam Notifications": "Exam Notifications",
+        "Office Notifications": "Office Notifications",
+        "Scholarship Section": "Scholarship Section",
+        "Application Formats": "Application Formats",
+        "Cultural Events": "Cultural Events",
+        "Technical Clubs": "Technical Clubs",
+        "IEEE & CSI": "IEEE & CSI"
+    }
+    _SECTION_KEYS = tuple(_SECTIONS_MAP.values())
+
+    _XP_SECTIONS = etree.XPath("//section[contains(concat(' ', normalize-space(@class), ' '), ' block ')]")
+    _XP_H2 = etree.XPath("(.//h2)[1]")
+    _XP_CONTENT = etree.XPath("(.//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')])[1]")
+    _XP_POSTS = etree.XPath(".//li[contains(concat(' ', normalize-space(@class), ' '), ' post ')]")
+    _XP_LINKS = etree.XPath(".//a | .//li")
+    _XP_ANCHOR = etree.XPath("(.//a)[1]")
+
     def __init__(self):
         self.config = load_config()
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"Accept-Encoding": "gzip, deflate"},
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        )
         self.storage = MongoStorage(
             mongo_uri=self.config.MONGO_URI,
             db_name=self.config.MONGO_DB_NAME,
             collection=self.config.MONGO_COLLECTION,
         )
         self._tick_task: asyncio.Task | None = None
+        self._etag: str | None = None
+        self._last_mod: str | None = None
+        self._content_hash: bytes | None = None
+        self._cached_parse: dict = {}
+        self._seen: dict[str, set[tuple[str, str]]] | None = None
         self.application = (
             Application.builder()
             .token(self.config.TOKEN)
@@ -60,94 +106,102 @@ class NotificationBot:
                 await self.storage.close()
 
     async def get_latest_notifications(self):
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_mod:
+            headers["If-Modified-Since"] = self._last_mod
         try:
-            async with self.session.get(self.config.CLONED_PAGE_URL) as response:
+            async with self.session.get(self.config.CLONED_PAGE_URL, headers=headers) as response:
+                if response.status == 304:
+                    return self._cached_parse
                 if response.status == 200:
-                    content = await response.text()
-                    return self.parse_content(content)
+                    content = await response.read()
+                    content_hash = hashlib.blake2b(content, digest_size=16).digest()
+                    if content_hash != self._content_hash:
+                        loop = asyncio.get_running_loop()
+                        self._cached_parse = await loop.run_in_executor(
+                            None, self.parse_content, content, response.get_encoding()
+                        )
+                        self._content_hash = content_hash
+                    self._etag = response.headers.get("ETag")
+                    self._last_mod = response.headers.get("Last-Modified")
+                    return self._cached_parse
                 logger.error(f"HTTP Error: {response.status}")
                 return {}
         except Exception as e:
             logger.error(f"Fetch error: {str(e)}")
             return {}
 
-    def parse_content(self, content):
-        notifications = {
-            "Latest Announcements": [],
-            "Exam Notifications": [],
-            "Office Notifications": [],
-            "Scholarship Section": [],
-            "Application Formats": [],
-            "Cultural Events": [],
-            "Technical Clubs": [],
-            "IEEE & CSI": []
-        }
-
-        sections_map = {
-            "Latest announcements": "Latest Announcements",
-            "Exam Notifications": "Exam Notifications",
-            "Office Notifications": "Office Notifications",
-            "Scholarship Section": "Scholarship Section",
-            "Application Formats": "Application Formats",
-            "Cultural Events": "Cultural Events",
-            "Technical Clubs": "Technical Clubs",
-            "IEEE & CSI": "IEEE & CSI"
-        }
-
-        soup = BeautifulSoup(content, 'html.parser')
-        sections = soup.select('section.block')
-
-        for section in sections:
-            header = section.find('h2')
+    def parse_content(self, content, encoding: str | None = None):
+        notifications = {k: [] for k in self._SECTION_KEYS}
+        clean = self.clean_text
+        element_text = self.element_text
+
+        if not content or not content.strip():
+            return notifications
+
+        try:
+            parser = etree.HTMLParser(encoding=encoding)
+        except LookupError:
+            content = content.decode(encoding, errors='replace')
+            parser = etree.HTMLParser()
+        root = etree.fromstring(content, parser)
+        if root is None:
+            return notifications
+
+        for section in self._XP_SECTIONS(root):
+            header = self._XP_H2(section)
             if not header:
                 continue
 
-            section_title = header.get_text(strip=True)
-            section_key = sections_map.get(section_title)
+            section_title = element_text(header[0])
+            section_key = self._SECTIONS_MAP.get(section_title)
             if not section_key:
                 logger.warning(f"Skipping unknown section: {section_title}")
                 continue
 
-            content_div = section.find('div', class_='content')
+            content_div = self._XP_CONTENT(section)
             if not content_div:
                 continue
 
+            append = notifications[section_key].append
             items = []
             if section_key == "Latest Announcements":
-                items = content_div.find_all('li', class_='post')
+                items = self._XP_POSTS(content_div[0])
             else:
-                items = content_div.find_all(['a', 'li'])
+                items = self._XP_LINKS(content_div[0])
 
             for item in items:
                 try:
                     if section_key == "Latest Announcements":
-                        anchor = item.find('a')
-                        if not anchor:
+                        anchor, date_el, name_el = self.post_parts(item)
+                        if anchor is None:
                             continue
-                        title = anchor.get_text(strip=True)
-                        link = anchor['href']
-                        date = item.find('div', class_='date').get_text(strip=True)
-                        author = item.find('div', class_='name').get_text(strip=True)
-                        notifications[section_key].append({
-                            "title": self.clean_text(title),
+                        title = element_text(anchor)
+                        link = anchor.attrib['href']
+                        date = element_text(date_el)
+                        author = element_text(name_el)
+                        append({
+                            "title": clean(title),
                             "link": link,
                             "date": date,
                             "author": author
                         })
                     else:
-                        if item.name == 'a':
-                            title = item.get_text(strip=True)
-                            link = item['href']
-                        elif item.name == 'li':
-                            anchor = item.find('a')
+                        if item.tag == 'a':
+                            title = element_text(item)
+                            link = item.attrib['href']
+                        elif item.tag == 'li':
+                            anchor = self._XP_ANCHOR(item)
                             if not anchor:
                                 continue
-                            link = anchor['href']
-                            title = item.get_text(strip=True).replace('\n', ' ')
+                            link = anchor[0].attrib['href']
+                            title = element_text(item).replace('\n', ' ')
                         else:
                             continue
-                        notifications[section_key].append({
-                            "title": self.clean_text(title),
+                        append({
+                            "title": clean(title),
                             "link": link
                         })
                 except Exception as e:
@@ -156,55 +210,102 @@ class NotificationBot:
 
         return notifications
 
+    def post_parts(self, post):
+        anchor = date_el = name_el = None
+        for el in post.iter('a', 'div'):
+            if el.tag == 'a':
+                if anchor is None:
+                    anchor = el
+            else:
+                classes = (el.get('class') or '').split()
+                if date_el is None and 'date' in classes:
+                    date_el = el
+                if name_el is None and 'name' in classes:
+                    name_el = el
+            if anchor is not None and date_el is not None and name_el is not None:
+                break
+        return anchor, date_el, name_el
+
+    def element_text(self, element):
+        return ''.join(text.strip() for text in element.itertext())
+
     def clean_text(self, text, for_markdown: bool = False):
+        return self._clean_cached(text, for_markdown)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _clean_cached(text: str, for_markdown: bool) -> str:
         if for_markdown:
-            markdown_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-            for char in markdown_chars:
-                text = text.replace(char, f"\\{char}")
+            text = _MD_RE.sub(r'\\\g<0>', text)
         else:
             text = text.replace('\\', '')
         return " ".join(text.split())
 
     async def check_for_updates(self):
         current = await self.get_latest_notifications()
-        previous = await self.storage.load_state()
-        new_notifications = self.find_new_notifications(current, previous)
+        if self._seen is None:
+            previous = await self.storage.load_state()
+            self._seen = {
+                section: {(item['title'], item['link']) for item in items}
+                for section, items in previous.items()
+            }
+        new_notifications = self.find_new_notifications(current, self._seen)
         if any(new_notifications.values()):
             await self.send_notifications(new_notifications)
-            await self.storage.save_state(current)
-            total = sum(len(v) for v in current.values())
-            logger.info(f"Saved state to MongoDB with {total} items across {len(current)} sections")
+            await self.storage.save_state(new_notifications)
+            for section, items in new_notifications.items():
+                self._seen.setdefault(section, set()).update((item['title'], item['link']) for item in items)
+            total = sum(len(v) for v in new_notifications.values())
+            logger.info(f"Saved {total} new items to MongoDB across {len(new_notifications)} sections")
 
-    def find_new_notifications(self, current, previous):
-        return {
-            section: [item for item in current.get(section, []) if item not in previous.get(section, [])]
-            for section in current
-        }
+    def find_new_notifications(self, current, seen):
+        new_notifications = {}
+        for section, items in current.items():
+            section_seen = seen.get(section, set())
+            new_notifications[section] = [item for item in items if (item['title'], item['link']) not in section_seen]
+        return new_notifications
 
     def format_telegram_message(self, section, item):
-        clean_section = self.clean_text(section, for_markdown=False)
-        clean_title = self.clean_text(item['title'], for_markdown=False)
-        link = item['link']
-        base = f"📣 New {clean_section}!\n\n{clean_title}\n🔗 {link}"
-        if all(key in item for key in ('date', 'author')):
-            clean_date = self.clean_text(item['date'], for_markdown=False)
-            clean_author = self.clean_text(item['author'], for_markdown=False)
-            return f"{base}\n🗓 {clean_date}\n👤 {clean_author}"
-        return base
+        tpl = _TG_FULL if 'date' in item and 'author' in item else _TG_SHORT
+        return tpl.format_map({
+            "section": self.clean_text(section),
+            "title": self.clean_text(item['title']),
+            "link": item['link'],
+            "date": self.clean_text(item.get('date', '')),
+            "author": self.clean_text(item.get('author', '')),
+        })
 
     def format_whatsapp_message(self, section, item):
-        message = f"📢 New {section} Alert!\n{item['title']}\n🔗 {item['link']}"
-        if 'date' in item and 'author' in item:
-            message += f"\n🗓 {item['date']}\n👤 {item['author']}"
-        return message
+        tpl = _WA_FULL if 'date' in item and 'author' in item else _WA_SHORT
+        return tpl.format_map({
+            "section": section,
+            "title": item['title'],
+            "link": item['link'],
+            "date": item.get('date', ''),
+            "author": item.get('author', ''),
+        })
+
+    def chunk_messages(self, messages, limit: int = 3800):
+        chunks: list[str] = []
+        buf = ''
+        for msg in messages:
+            if buf and len(buf) + len(msg) + 2 > limit:
+                chunks.append(buf)
+                buf = msg
+            else:
+                buf = f"{buf}\n\n{msg}" if buf else msg
+        if buf:
+            chunks.append(buf)
+        return chunks
 
     async def send_notifications(self, new_notifications):
         telegram_messages: list[str] = []
         whatsapp_messages: list[str] = []
 
         for section, items in new_notifications.items():
+            section_messages = [self.format_telegram_message(section, item) for item in items]
+            telegram_messages.extend(self.chunk_messages(section_messages))
             for item in items:
-                telegram_messages.append(self.format_telegram_message(section, item))
                 whatsapp_messages.append(self.format_whatsapp_message(section, item))
 
         if self.telegram_sender and telegram_messages:
@@ -13,12 +13,26 @@ class WhatsAppSender:
         self._api_url = api_url
         self._auth_token = auth_token
         self._recipient = recipient
+        self._headers = {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "authorization": f"Bearer {self._auth_token}",
+            "connection": "keep-alive",
+        }
 
-    async def send_items(self, messages: list[str], spacing_seconds: float = 0.7):
+    async def send_items(self, messages: list[str], spacing_seconds: float = 0.7, max_concurrency: int = 4):
         logger.info(f"WhatsAppSender received {len(messages)} messages to send.")
-        for message in messages:
-            await self._send_one(message)
-            await asyncio.sleep(spacing_seconds)
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def _bounded(message: str) -> None:
+            async with sem:
+                await self._send_one(message)
+                await asyncio.sleep(spacing_seconds)
+
+        results = await asyncio.gather(*(_bounded(m) for m in messages), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send WhatsApp message: {str(result)}")
 
     async def _send_one(self, body: str) -> None:
         payload: Dict[str, Any] = {
@@ -26,12 +40,7 @@ class WhatsAppSender:
             "to": self._recipient,
             "body": body,
         }
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "authorization": f"Bearer {self._auth_token}",
-        }
-        async with self._session.post(self._api_url, json=payload, headers=headers) as resp:
+        async with self._session.post(self._api_url, json=payload, headers=self._headers) as resp:
             if resp.status != 200:
                 txt = await resp.text()
                 logger.error(f"Failed to send WhatsApp message: {txt}")
@@ -1,7 +1,8 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, UpdateOne
 
 logger = logging.getLogger(__name__)
 
@@ -12,29 +13,54 @@ class MongoStorage:
         self._db = self._client[db_name]
         self._collection = self._db[collection]
         self._doc_id = "state"
+        self._indexed = False
 
     async def load_state(self) -> Dict[str, Any]:
         try:
-            doc = await self._collection.find_one({"_id": self._doc_id})
-            if not doc:
-                return {}
-            data = doc.get("data", {})
-            if isinstance(data, dict):
-                return data
-            return {}
+            await self._migrate_legacy_state()
+            state: Dict[str, List[Dict[str, Any]]] = {}
+            async for doc in self._collection.find({"section": {"$exists": True}}, {"_id": 0}):
+                section = doc.pop("section")
+                state.setdefault(section, []).append(doc)
+            return state
         except Exception as e:
             logger.error(f"Mongo load_state error: {str(e)}")
             return {}
 
-    async def save_state(self, data: Dict[str, Any]) -> None:
+    async def _migrate_legacy_state(self) -> None:
+        doc = await self._collection.find_one({"_id": self._doc_id})
+        if not doc:
+            return
+        data = doc.get("data", {})
+        if isinstance(data, dict):
+            await self._upsert_items(data)
+            logger.info(f"Migrated legacy state with {sum(len(v) for v in data.values())} items to per-item documents")
+        await self._collection.delete_one({"_id": self._doc_id})
+
+    async def save_state(self, new_notifications: Dict[str, Any]) -> None:
         try:
-            await self._collection.update_one(
-                {"_id": self._doc_id},
-                {"$set": {"data": data}},
-                upsert=True,
-            )
+            await self._upsert_items(new_notifications)
         except Exception as e:
             logger.error(f"Mongo save_state error: {str(e)}")
 
+    async def _upsert_items(self, notifications: Dict[str, Any]) -> None:
+        ops = [
+            UpdateOne(
+                {"section": section, "title": item["title"], "link": item["link"]},
+                {"$set": item | {"section": section}},
+                upsert=True,
+            )
+            for section, items in notifications.items()
+            for item in items
+        ]
+        if not ops:
+            return
+        if not self._indexed:
+            await self._collection.create_index(
+                [("section", ASCENDING), ("title", ASCENDING), ("link", ASCENDING)]
+            )
+            self._indexed = True
+        await self._collection.bulk_write(ops, ordered=False)
+
     async def close(self) -> None:
-        self._client.close() 
\ No newline at end of file
+        self._client.close()